@@ -7,9 +7,14 @@ keys against ComfyUI's own key-mapping for the connected model.
 Incompatible LoRAs are silently skipped — no log pollution.
 """
 
+import json
+import os
+import weakref
+
 import folder_paths
-import comfy.lora
-from nodes import LoraLoader
+
+# comfy.lora, nodes.LoraLoader and torch are imported where used; no module
+# in this pack imports comfy.*, nodes or torch at top level.
 
 
 # ── Flexible input type ────────────────────────────────────────────────────────
@@ -45,62 +50,129 @@ _LORA_SUFFIXES = (
     ".diff",           ".diff_b",
 )
 
+_LORA_SUFFIX_LENS = tuple((sfx, len(sfx)) for sfx in _LORA_SUFFIXES)
+
+
+# BaseModel → LoRA key map.  LoRA-patched clones of a ModelPatcher share the
+# same .model, so the map is built once per loaded checkpoint.
+_model_map_cache = weakref.WeakKeyDictionary()
+
+# Upper bound on a sane header length; anything larger is not a safetensors
+# file (e.g. the zip signature of a .ckpt read as a length).
+_SAFETENSORS_MAX_HEADER = 100 * 1024 * 1024
+
+# lora_path → (mtime_ns, keys, base_keys); a changed mtime invalidates the entry.
+_lora_keys_cache = {}
+
 
 def _read_lora_keys(lora_path):
     """Return the set of tensor key names without loading weights."""
-    # Fast path: safetensors header only
+    # Fast path: parse the safetensors header directly — an 8-byte
+    # little-endian length followed by a JSON object keyed by tensor name.
+    # No torch / safetensors machinery involved.
     try:
-        from safetensors import safe_open
-        with safe_open(lora_path, framework="pt", device="cpu") as f:
-            return set(f.keys())
+        with open(lora_path, "rb") as f:
+            n = int.from_bytes(f.read(8), "little")
+            if 0 < n <= _SAFETENSORS_MAX_HEADER:
+                header = json.loads(f.read(n))
+                if isinstance(header, dict):
+                    return frozenset(k for k in header if k != "__metadata__")
     except Exception:
         pass
     # Fallback: full torch load (older .ckpt / .pt files)
     try:
         import torch
         sd = torch.load(lora_path, map_location="cpu", weights_only=True)
-        return set(sd.keys())
+        return frozenset(sd.keys())
     except Exception:
         return None
 
 
-def _check_compat(model, lora_path):
+def _base_keys(lora_keys):
+    """Strip LoRA suffixes to get base key names; keys without one are dropped."""
+    if lora_keys is None:
+        return None
+    base_keys = set()
+    for k in lora_keys:
+        for sfx, n in _LORA_SUFFIX_LENS:
+            if k.endswith(sfx):
+                base_keys.add(k[:-n])
+                break
+    return frozenset(base_keys)
+
+
+def _cached_lora_keys(lora_path):
+    """Return (keys, base_keys), memoized per file until its mtime changes."""
+    try:
+        mtime = os.stat(lora_path).st_mtime_ns
+    except OSError:
+        keys = _read_lora_keys(lora_path)
+        return keys, _base_keys(keys)
+    cached = _lora_keys_cache.get(lora_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1:]
+    keys = _read_lora_keys(lora_path)
+    base_keys = _base_keys(keys)
+    _lora_keys_cache[lora_path] = (mtime, keys, base_keys)
+    return keys, base_keys
+
+
+def _model_key_map(model):
     """
-    Return (compatible: bool, reason: str).
+    Return (model_map, reason).
 
-    Uses ComfyUI's own model_lora_keys_unet() to build the expected key map
-    for the connected model, then checks whether any LoRA base-key appears in
-    that map.  Reads only the safetensors header — no weight tensors loaded.
+    model_map is the expected LoRA key map built by ComfyUI's own
+    model_lora_keys_unet() for the connected model, or None with a reason
+    when there is no model or the map can't be built.
     """
     if model is None:
-        return True, "no model"
+        return None, "no model"
 
-    lora_keys = _read_lora_keys(lora_path)
-    if lora_keys is None:
-        return True, "unreadable"
-    if not lora_keys:
-        return True, "empty"
+    base_model = getattr(model, "model", None)
+    try:
+        return _model_map_cache[base_model], ""
+    except (KeyError, TypeError):
+        pass
 
-    # Build model's expected LoRA key map via ComfyUI's own utility
     try:
+        import comfy.lora
         model_map = {}
-        comfy.lora.model_lora_keys_unet(model.model, model_map)
+        comfy.lora.model_lora_keys_unet(base_model, model_map)
     except Exception as e:
-        return True, f"key-map error: {e}"
+        return None, f"key-map error: {e}"
 
-    # Strip LoRA suffixes to get base key names, then check against model map
-    base_keys = set()
-    for k in lora_keys:
-        for sfx in _LORA_SUFFIXES:
-            if k.endswith(sfx):
-                base_keys.add(k[: -len(sfx)])
-                break
+    try:
+        _model_map_cache[base_model] = model_map
+    except TypeError:
+        pass
+    return model_map, ""
+
+
+def _check_compat(model_map, lora_path, map_reason=""):
+    """
+    Return (compatible: bool, reason: str).
+
+    Checks whether any LoRA base-key appears in model_map (see
+    _model_key_map()).  Reads only the safetensors header — no weight
+    tensors loaded.  A missing model_map counts as compatible, with
+    map_reason as the reason.
+    """
+    if model_map is None:
+        return True, map_reason
+
+    lora_keys, base_keys = _cached_lora_keys(lora_path)
+    if lora_keys is None:
+        return True, "unreadable"
+    if not lora_keys:
+        return True, "empty"
 
     if not base_keys:
         return True, "no weight keys found"
 
-    matches = sum(1 for k in base_keys if k in model_map)
-    return matches > 0, f"{matches}/{len(base_keys)} keys matched"
+    # One matching key is enough; the reason is only logged on a skip.
+    if not base_keys.isdisjoint(model_map):
+        return True, "keys matched"
+    return False, f"0/{len(base_keys)} keys matched"
 
 
 # ── Node ───────────────────────────────────────────────────────────────────────
@@ -127,6 +199,9 @@ class OliLoraLoader:
     FUNCTION     = "load_loras"
     OUTPUT_NODE  = True   # needed to return compat info to the JS front-end
 
+    def __init__(self):
+        self._lora_loader = None  # nodes.LoraLoader, created on first use
+
     def load_loras(self, enable=True, model=None, clip=None, lora_stack=None, **kwargs):
         # Pass-through mode: return inputs unchanged, no lora applied
         if not enable:
@@ -135,9 +210,18 @@ class OliLoraLoader:
                 "result": (list(lora_stack) if lora_stack else [], model, clip),
             }
 
+        # One LoraLoader per node instance: its loaded_lora cache then survives
+        # across rows and queue runs instead of being discarded per call.
+        if self._lora_loader is None:
+            from nodes import LoraLoader
+            self._lora_loader = LoraLoader()
+
         compat    = {}              # filename → True | False | None (disabled)
         out_stack = []
 
+        # Key map of the incoming model; LoRA-patched clones below share it.
+        model_map, map_reason = _model_key_map(model)
+
         # ── 1. Apply incoming stack loras, filtering incompatible ones if model is known ──
         for entry in (lora_stack or []):
             filename, strength_model, strength_clip = entry
@@ -151,7 +235,7 @@ class OliLoraLoader:
                     compat[filename] = False
                     continue
 
-                compatible, reason = _check_compat(model, lora_path)
+                compatible, reason = _check_compat(model_map, lora_path, map_reason)
                 compat[filename] = compatible
 
                 if not compatible:
@@ -159,7 +243,7 @@ class OliLoraLoader:
                           f"Skip incompatible LoRA: {filename} ({reason})")
                     continue
 
-                model, clip = LoraLoader().load_lora(
+                model, clip = self._lora_loader.load_lora(
                     model, clip, filename, strength_model, strength_clip
                 )
 
@@ -198,7 +282,7 @@ class OliLoraLoader:
                 compat[filename] = False
                 continue
 
-            compatible, reason = _check_compat(model, lora_path)
+            compatible, reason = _check_compat(model_map, lora_path, map_reason)
             compat[filename] = compatible
 
             if not compatible:
@@ -211,7 +295,7 @@ class OliLoraLoader:
                               strength_clip if strength_clip is not None else strength_model))
 
             if model is not None:
-                model, clip = LoraLoader().load_lora(
+                model, clip = self._lora_loader.load_lora(
                     model, clip, filename, strength_model, strength_clip
                 )
 
@@ -7,18 +7,21 @@ plus the title of the upstream node that produced it.
 from .utils import get_model_details, get_upstream_label
 
 
+_INPUT_TYPES = {
+    "optional": {
+        "model": ("*",),
+    },
+    "hidden": {
+        "unique_id":     "UNIQUE_ID",
+        "extra_pnginfo": "EXTRA_PNGINFO",
+    },
+}
+
+
 class OliModelInfo:
     @classmethod
     def INPUT_TYPES(cls):
-        return {
-            "optional": {
-                "model": ("*",),
-            },
-            "hidden": {
-                "unique_id":     "UNIQUE_ID",
-                "extra_pnginfo": "EXTRA_PNGINFO",
-            },
-        }
+        return _INPUT_TYPES
 
     RETURN_TYPES = ("STRING", "INT", "STRING")
     RETURN_NAMES = ("class_name", "dim", "label")
@@ -4,7 +4,6 @@ OliNodeLabel — passes any value through and outputs the upstream node's title.
 See oli_utils.get_upstream_label() for traversal semantics.
 """
 
-import nodes as _comfy_nodes
 from .utils import get_upstream_label
 
 
@@ -15,22 +14,25 @@ class _AnyType(str):
 _any = _AnyType("*")
 
 
+_INPUT_TYPES = {
+    "required": {
+        "depth": ("INT", {"default": 1, "min": 1, "max": 10, "step": 1}),
+    },
+    "optional": {
+        "node": (_any,),
+    },
+    "hidden": {
+        "unique_id":     "UNIQUE_ID",
+        "extra_pnginfo": "EXTRA_PNGINFO",
+    },
+}
+
+
 class OliNodeLabel:
 
     @classmethod
     def INPUT_TYPES(cls):
-        return {
-            "required": {
-                "depth": ("INT", {"default": 1, "min": 1, "max": 10, "step": 1}),
-            },
-            "optional": {
-                "node": (_any,),
-            },
-            "hidden": {
-                "unique_id":     "UNIQUE_ID",
-                "extra_pnginfo": "EXTRA_PNGINFO",
-            },
-        }
+        return _INPUT_TYPES
 
     RETURN_TYPES = (_any, "STRING")
     RETURN_NAMES = ("node", "label")
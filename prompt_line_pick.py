@@ -36,6 +36,32 @@ This is the established ComfyUI pattern for this class of problem.
 
 import hashlib
 
+_INDEX_CACHE_SIZE = 32  # per-instance (seed, unique_id, len) → index memo entries
+
+
+def _uncorrelated_index(seed, unique_id, n):
+    """Seed-derived index in [0, n), independent between node instances."""
+    # Same index as int(hexdigest(), 16), without the hex round-trip.
+    digest = hashlib.sha256(f"{seed}:{unique_id}".encode()).digest()
+    return int.from_bytes(digest, "big") % n
+
+
+def _pick_line(text, index_fn, remove_empty_lines):
+    """Return the line at index_fn(n) among the n candidate lines, or None.
+
+    Without empty-line removal every line is a candidate, so n is simply
+    the newline count + 1 and only the picked line gets stripped.  With
+    removal, blank lines make that count an overestimate, so the non-empty
+    stripped lines are collected first and n is their count.
+    """
+    if not remove_empty_lines:
+        return text.split("\n")[index_fn(text.count("\n") + 1)].strip()
+
+    lines = [s for s in map(str.strip, text.split("\n")) if s]
+    if not lines:
+        return None
+    return lines[index_fn(len(lines))]
+
 
 class _ComboType(str):
     """str subclass whose __ne__ always returns False.
@@ -54,49 +80,52 @@ class _ComboType(str):
 _COMBO = _ComboType("COMBO")
 
 
-class OliPromptLinePick:
-    @classmethod
-    def INPUT_TYPES(cls):
-        return {
-            "required": {
-                "prompt": (
-                    "STRING",
-                    {
-                        "multiline": True,
-                        "default": "prompt 1\nprompt 2\nprompt3",
-                    },
-                ),
-                "seed": (
-                    "INT",
-                    {
-                        "default": 0,
-                        "min": 0,
-                        "max": 0xFFFFFFFFFFFFFFFF,
-                        "control_after_generate": "fixed",
-                    },
-                ),
-                "remove_empty_lines": ("BOOLEAN", {"default": True}),
-                "uncorrelate": (
-                    "BOOLEAN",
-                    {
-                        "default": True,
-                        "tooltip": (
-                            "When on, index = sha256(seed:node_id) % len — each node instance "
-                            "picks independently even with the same seed, avoiding correlation "
-                            "between lists of the same or multiple lengths. "
-                            "When off, index = seed % len — standard index behavior which could "
-                            "result in correlated picks between similar-length lists."
-                        ),
-                    },
-                ),
+_INPUT_TYPES = {
+    "required": {
+        "prompt": (
+            "STRING",
+            {
+                "multiline": True,
+                "default": "prompt 1\nprompt 2\nprompt3",
             },
-            "optional": {
-                "optional_prompt_list": ("LIST", {}),
+        ),
+        "seed": (
+            "INT",
+            {
+                "default": 0,
+                "min": 0,
+                "max": 0xFFFFFFFFFFFFFFFF,
+                "control_after_generate": "fixed",
             },
-            "hidden": {
-                "unique_id": "UNIQUE_ID",
+        ),
+        "remove_empty_lines": ("BOOLEAN", {"default": True}),
+        "uncorrelate": (
+            "BOOLEAN",
+            {
+                "default": True,
+                "tooltip": (
+                    "When on, index = sha256(seed:node_id) % len — each node instance "
+                    "picks independently even with the same seed, avoiding correlation "
+                    "between lists of the same or multiple lengths. "
+                    "When off, index = seed % len — standard index behavior which could "
+                    "result in correlated picks between similar-length lists."
+                ),
             },
-        }
+        ),
+    },
+    "optional": {
+        "optional_prompt_list": ("LIST", {}),
+    },
+    "hidden": {
+        "unique_id": "UNIQUE_ID",
+    },
+}
+
+
+class OliPromptLinePick:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return _INPUT_TYPES
 
     RETURN_TYPES = ("STRING", _COMBO, "LIST", "STRING", "INT")
     RETURN_NAMES = ("STRING", "COMBO", "prompt_list", "prompt_strings", "seed")
@@ -104,6 +133,22 @@ class OliPromptLinePick:
     FUNCTION = "execute"
     CATEGORY = "Oli/prompt"
 
+    def __init__(self):
+        # ComfyUI's output cache skips execute() while inputs are unchanged,
+        # so this only hits when the prompt is edited but keeps its candidate
+        # line count. Eviction is FIFO (dict insertion order), not LRU.
+        self._index_cache = {}
+
+    def _cached_index(self, seed, unique_id, n):
+        key = (seed, unique_id, n)
+        index = self._index_cache.get(key)
+        if index is None:
+            index = _uncorrelated_index(seed, unique_id, n)
+            if len(self._index_cache) >= _INDEX_CACHE_SIZE:
+                del self._index_cache[next(iter(self._index_cache))]
+            self._index_cache[key] = index
+        return index
+
     def execute(
         self,
         prompt,
@@ -113,28 +158,20 @@ class OliPromptLinePick:
         optional_prompt_list=None,
         unique_id=None,
     ):
-        lines = prompt.split("\n")
-
-        if remove_empty_lines:
-            lines = [line.strip() for line in lines if line.strip()]
+        if uncorrelate:
+            index_fn = lambda n: self._cached_index(seed, unique_id, n)
         else:
-            lines = [line.strip() for line in lines]
+            index_fn = lambda n: seed % n
+
+        picked = _pick_line(prompt, index_fn, remove_empty_lines)
 
         out_list = (
             list(optional_prompt_list) if optional_prompt_list is not None else []
         )
 
-        if not lines:
+        if picked is None:
             return ("", [], out_list, out_list, seed)
 
-        if uncorrelate:
-            digest = hashlib.sha256(f"{seed}:{unique_id}".encode()).hexdigest()
-            index = int(digest, 16) % len(lines)
-        else:
-            index = seed % len(lines)
-
-        picked = lines[index]
-
         # COMBO output is a single-element list. OUTPUT_IS_LIST=True gives it
         # the list icon. The _ComboType subclass handles validation bypass.
         out_list.append(picked)
@@ -13,17 +13,56 @@ get_upstream_label(extra_pnginfo, unique_id, input_name, depth=1)
               found at the target level the labels cycle one per execution.
 """
 
-import nodes as _comfy_nodes
+import weakref
 
 # ---------------------------------------------------------------------------
 # Model introspection
 # ---------------------------------------------------------------------------
 
+# Candidate hidden-dim attribute names, in lookup order (shared with
+# video_frame_limit).
 _DIM_ATTRS = (
     "hidden_size", "dim", "embed_dim", "hidden_dim",
     "d_model", "inner_dim", "width", "model_dim",
 )
 
+# Per-object memo for the introspection helpers below. Weak keys: entries
+# vanish with the model, and a recycled id() can never return stale data.
+_dim_cache     = weakref.WeakKeyDictionary()  # inner model → (dim,)
+_details_cache = weakref.WeakKeyDictionary()  # MODEL/CLIP/VAE → (lines, class_name, dim)
+_numel_cache   = weakref.WeakKeyDictionary()  # module → total parameter count
+
+
+def _cache_get(cache, obj):
+    try:
+        return cache.get(obj)
+    except TypeError:  # not weak-referenceable
+        return None
+
+
+def _cache_set(cache, obj, value):
+    try:
+        cache[obj] = value
+    except TypeError:
+        pass
+
+
+# type → {attr: tuple of that attr's __dict__ entries along the MRO}, so each
+# class hierarchy is walked once per attribute instead of on every lookup.
+_class_attr_cache: dict = {}
+
+
+def _class_attr_entries(cls, attr):
+    per_class = _class_attr_cache.get(cls)
+    if per_class is None:
+        per_class = _class_attr_cache[cls] = {}
+    entries = per_class.get(attr)
+    if entries is None:
+        entries = per_class[attr] = tuple(
+            c.__dict__[attr] for c in cls.__mro__ if attr in c.__dict__
+        )
+    return entries
+
 
 def _safe_getattr(obj, attr, default=None):
     """Get attribute without triggering ComfyUI model_config __getattr__ warnings."""
@@ -33,22 +72,32 @@ def _safe_getattr(obj, attr, default=None):
             return d[attr]
     except (AttributeError, TypeError):
         pass
-    for cls in type(obj).__mro__:
-        if attr in cls.__dict__:
-            v = cls.__dict__[attr]
-            if isinstance(v, property):
-                try:
-                    return v.fget(obj)
-                except Exception:
-                    pass
-            elif not callable(v) and not isinstance(v, (staticmethod, classmethod)):
-                return v
+    for v in _class_attr_entries(type(obj), attr):
+        if isinstance(v, property):
+            try:
+                return v.fget(obj)
+            except Exception:
+                pass
+        elif not callable(v) and not isinstance(v, (staticmethod, classmethod)):
+            return v
     return default
 
 
+def _count_numel(obj):
+    """Total parameter count of a torch module, computed once per module.
+
+    Raises whatever obj.parameters() raises for non-modules.
+    """
+    n = _cache_get(_numel_cache, obj)
+    if n is None:
+        n = sum([p.numel() for p in obj.parameters()])
+        _cache_set(_numel_cache, obj, n)
+    return n
+
+
 def _count_params(obj):
     try:
-        n = sum(p.numel() for p in obj.parameters())
+        n = _count_numel(obj)
         if n >= 1_000_000_000:
             return f"{n / 1e9:.1f}B"
         if n >= 1_000_000:
@@ -59,6 +108,15 @@ def _count_params(obj):
 
 
 def _find_dim(obj):
+    cached = _cache_get(_dim_cache, obj)
+    if cached is not None:
+        return cached[0]
+    dim = _scan_dim(obj)
+    _cache_set(_dim_cache, obj, (dim,))
+    return dim
+
+
+def _scan_dim(obj):
     search = [obj]
     for attr in ("diffusion_model", "transformer", "model", "net", "backbone"):
         sub = getattr(obj, attr, None)
@@ -87,6 +145,16 @@ def get_model_details(model):
     if model is None:
         return ["—"], "", 0
 
+    cached = _cache_get(_details_cache, model)
+    if cached is None:
+        cached = _model_details(model)
+        _cache_set(_details_cache, model, cached)
+    lines, class_name, dim = cached
+    return list(lines), class_name, dim
+
+
+def _model_details(model):
+    """Uncached body of get_model_details(); returns (lines, class_name, dim)."""
     outer_class = type(model).__name__
     lines = []
 
@@ -99,7 +167,7 @@ def get_model_details(model):
         p = _count_params(inner)
         if p:
             lines.append(f"params: {p}")
-        return lines, class_name, 0
+        return tuple(lines), class_name, 0
 
     # ── VAE ───────────────────────────────────────────────────────────────
     if outer_class == "VAE" or hasattr(model, "first_stage_model"):
@@ -110,7 +178,7 @@ def get_model_details(model):
         p = _count_params(inner)
         if p:
             lines.append(f"params: {p}")
-        return lines, class_name, 0
+        return tuple(lines), class_name, 0
 
     # ── MODEL (ModelPatcher or GGUFModelPatcher) ───────────────────────────
     fmt = "gguf" if "GGUF" in outer_class else "standard"
@@ -142,7 +210,7 @@ def get_model_details(model):
 
     lines.append(f"format: {fmt}")
 
-    return lines, class_name, dim
+    return tuple(lines), class_name, dim
 
 
 # ---------------------------------------------------------------------------
@@ -165,10 +233,12 @@ def get_upstream_label(extra_pnginfo, unique_id, input_name, depth=1):
       per execution via an internal counter that resets on list change.
     - Muted nodes (mode=2) are excluded from traversal and collection.
     """
+    from nodes import NODE_DISPLAY_NAME_MAPPINGS
+
     workflow      = (extra_pnginfo or {}).get("workflow") or {}
     nodes_map     = {str(n["id"]): n for n in workflow.get("nodes", [])}
     links_map     = {str(l[0]): l  for l in workflow.get("links", [])}
-    display_names = _comfy_nodes.NODE_DISPLAY_NAME_MAPPINGS
+    display_names = NODE_DISPLAY_NAME_MAPPINGS
 
     def node_label(n):
         if not n:
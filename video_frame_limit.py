@@ -3,8 +3,8 @@ OliVideoFrameLimit — caps video duration to avoid OOM crashes.
 
 Formula derived from transformer peak VRAM:
 
-    max_frames = total_vram × safety / bytes_per_frame
-    bytes_per_frame = TENSOR_COPIES × tokens_per_frame × hidden_dim × 2
+    max_frames = (total_vram − foreign_vram) × safety / bytes_per_frame
+    bytes_per_frame = TENSOR_COPIES × tokens_per_frame × hidden_dim × dtype_bytes
 
 Where:
     TENSOR_COPIES = 5  (Q, K, V, attention output, residual — calibrated
@@ -12,24 +12,87 @@ Where:
                         Wan 1.3B hidden_dim=1536, close to the empirical 256)
     tokens_per_frame = (width ÷ 8) × (height ÷ 8)
     hidden_dim       = auto-detected from the connected model
-    × 2              = float16 bytes
+    dtype_bytes      = bytes per activation element — auto-detected from the
+                       model's compute dtype (2 for fp16/bf16, 4 for fp32),
+                       or pinned with the dtype_bytes input
 
 Why total VRAM (not free VRAM):
     ComfyUI offloads model weights layer by layer. Peak VRAM during inference
     is not "total − model_size" — it's the activation tensor size, which
     scales with total latent tokens (frames × spatial tokens).
+
+    The exception is memory held by *other* processes on a shared GPU, which
+    ComfyUI cannot offload: foreign_vram = total − free − this process's
+    reserved memory − a CUDA context allowance.  It is 0 on a dedicated GPU.
 """
 
-import torch
+import functools
+import os
+import weakref
 
-from .utils import _safe_getattr
+from .utils import _DIM_ATTRS, _count_numel, _safe_getattr
 
 TENSOR_COPIES = 5
+DEFAULT_DTYPE_BYTES = 2  # fp16 / bf16 — also the floor for auto-detection
 TEMPORAL_COMPRESSION = 4  # frame counts must be n*4+1 (Wan, HunyuanVideo, CogVideoX…)
 
+_DEBUG = os.environ.get("OLI_DEBUG") == "1"  # collect every hidden_dim candidate
+_UI_ENABLED = os.environ.get("OLI_QUIET") != "1"  # OLI_QUIET=1: no canvas text
+
+
+def _snap_frames(f):
+    """Round a frame count down to the nearest n × TEMPORAL_COMPRESSION + 1."""
+    return (f - 1) // TEMPORAL_COMPRESSION * TEMPORAL_COMPRESSION + 1 if f > 1 else 1
+
+
+# CUDA state, queried once: is_available() on first use; total memory once per
+# device index (looked up via current_device(), so a device switch is honoured).
+_cuda_ok = None
+
+
+def _cuda_available():
+    global _cuda_ok
+    if _cuda_ok is None:
+        import torch
+        _cuda_ok = torch.cuda.is_available()
+    return _cuda_ok
+
+
+@functools.lru_cache(maxsize=4)
+def _total_vram(device_index):
+    """Total VRAM in bytes of CUDA device `device_index`."""
+    import torch
+    return torch.cuda.get_device_properties(device_index).total_memory
+
+
+# A fresh CUDA context takes ~500 MB that torch.cuda.memory_reserved() does not
+# report; don't count our own as foreign usage.
+_CUDA_CONTEXT_RESERVE = 512 * 1024**2
+
+
+def _foreign_vram(device_index):
+    """VRAM in bytes used on the device by other processes (not offloadable)."""
+    import torch
+    free, total = torch.cuda.mem_get_info(device_index)
+    ours = torch.cuda.memory_reserved(device_index) + _CUDA_CONTEXT_RESERVE
+    return max(0, total - free - ours)
+
+
+@functools.lru_cache(maxsize=4)
+def _vram_gb_label(device_index):
+    return f"{_total_vram(device_index) / (1024**3):.1f}"
+
+
+# inner diffusion model → (class_name, hidden_dim, debug_lines); entries drop
+# with the model, so repeated queue runs skip the attribute / parameter walk.
+_model_info_cache = weakref.WeakKeyDictionary()
+
 
 def _get_model_info(model):
-    """Return (class_name, hidden_dim, debug_lines) from a ComfyUI MODEL object."""
+    """Return (class_name, hidden_dim, debug_lines) from a ComfyUI MODEL object.
+
+    debug_lines is only filled in with OLI_DEBUG=1.
+    """
     if model is None:
         return None, None, []
 
@@ -40,91 +103,217 @@ def _get_model_info(model):
         if sub is not None:
             m = sub
 
-    model_name = type(m).__name__
+    try:
+        return _model_info_cache[m]
+    except (KeyError, TypeError):  # TypeError: object not weak-referenceable
+        pass
+
+    info = _detect_model_info(m)
+    try:
+        _model_info_cache[m] = info
+    except TypeError:
+        pass
+    return info
+
+
+def _is_dim(val):
+    return isinstance(val, int) and 64 <= val <= 32768
 
-    # Build list of objects to search for hidden_dim
-    search = [m]
-    for attr in ("diffusion_model", "transformer", "model", "net", "backbone"):
-        sub = getattr(m, attr, None)
-        if sub is not None and sub is not m:
-            search.append(sub)
 
-    DIM_ATTRS = (
-        "hidden_size",
-        "dim",
-        "embed_dim",
-        "hidden_dim",
-        "d_model",
-        "inner_dim",
-        "width",
-        "model_dim",
-    )
-
-    found = {}  # attr -> value, deduplicated
+def _iter_dim_candidates(search):
+    """Yield (path, value) for each plausible hidden_dim in search order.
+
+    path is a tuple (obj, attr) or (obj, cfg_attr, attr); it is only turned
+    into a display string by _dim_path() when debug output is wanted.
+    """
     for obj in search:
-        obj_name = type(obj).__name__
-        for attr in DIM_ATTRS:
+        for attr in _DIM_ATTRS:
             val = _safe_getattr(obj, attr)
-            if isinstance(val, int) and 64 <= val <= 32768:
-                key = f"{obj_name}.{attr}"
-                found[key] = val
+            if _is_dim(val):
+                yield (obj, attr), val
         for cfg_attr in ("config", "model_config"):
             cfg = _safe_getattr(obj, cfg_attr)
             if cfg:
-                for attr in DIM_ATTRS:
+                for attr in _DIM_ATTRS:
                     val = _safe_getattr(cfg, attr)
-                    if isinstance(val, int) and 64 <= val <= 32768:
-                        key = f"{obj_name}.{cfg_attr}.{attr}"
-                        found[key] = val
+                    if _is_dim(val):
+                        yield (obj, cfg_attr, attr), val
 
-    debug_lines = [f"  {k} = {v}" for k, v in found.items()]
 
-    if found:
-        hidden_dim = next(iter(found.values()))
-        return model_name, hidden_dim, debug_lines
+def _dim_path(path):
+    return ".".join((type(path[0]).__name__,) + path[1:])
+
+
+def _detect_model_info(m):
+    """Uncached body of _get_model_info(), for an already unwrapped model.
+
+    The first plausible hidden_dim wins and the search stops there.
+    debug_lines stays empty unless OLI_DEBUG=1, which collects every candidate.
+    """
+    model_name = type(m).__name__
+
+    # Build list of objects to search for hidden_dim
+    search = [m]
+    for attr in ("diffusion_model", "transformer", "model", "net", "backbone"):
+        sub = getattr(m, attr, None)
+        if sub is not None and sub is not m:
+            search.append(sub)
+
+    candidates = _iter_dim_candidates(search)
+    if _DEBUG:
+        found = {_dim_path(p): v for p, v in candidates}  # deduplicated
+        first = next(iter(found.items()), None)
+        debug_lines = [f"  {k} = {v}" for k, v in found.items()]
+        print(f"\033[34m[Oli Video Frame Limit]\033[0m hidden_dim candidates "
+              f"for {model_name}:\n" + ("\n".join(debug_lines) or "  (none)"))
+    else:
+        first = next(candidates, None)
+        debug_lines = []
+
+    if first:
+        return model_name, first[1], debug_lines
 
     # Fallback: estimate from parameter count
     # Transformer: params ≈ 12 × num_layers × hidden_dim²  (typical L ≈ 28)
     try:
-        n = sum(p.numel() for p in m.parameters())
+        n = _count_numel(m)
         est = int((n / (12 * 28)) ** 0.5)
         standards = (256, 512, 768, 1024, 1280, 1536, 2048, 3072, 4096, 5120, 8192)
         hidden_dim = min(standards, key=lambda x: abs(x - est))
-        return model_name, hidden_dim, [f"  param count estimate: {hidden_dim}"]
+        debug_lines = [f"  param count estimate: {hidden_dim}"] if _DEBUG else []
+        return model_name, hidden_dim, debug_lines
     except Exception:
         return model_name, None, []
 
 
-class OliVideoFrameLimit:
-    @classmethod
-    def INPUT_TYPES(cls):
-        return {
-            "required": {
-                "width": ("INT", {"default": 832, "min": 64, "max": 8192, "step": 8}),
-                "height": ("INT", {"default": 480, "min": 64, "max": 8192, "step": 8}),
-                "fps": (
-                    "FLOAT",
-                    {"default": 16.0, "min": 1.0, "max": 120.0, "step": 1.0},
-                ),
-                "duration": (
-                    "FLOAT",
-                    {"default": 10.0, "min": 0.1, "max": 3600.0, "step": 0.1},
-                ),
-                "safety_margin": (
-                    "FLOAT",
-                    {
-                        "default": 0.95,
-                        "min": 0.01,
-                        # "max": 1.0,
-                        "step": 0.05,
-                        "tooltip": "Fraction of total VRAM to budget (0.95 = 5% headroom).",
-                    },
+def _activation_bytes(model):
+    """Bytes per activation element for a ComfyUI MODEL, or None if unknown.
+
+    Uses the compute dtype: BaseModel.manual_cast_dtype when weights are cast
+    on the fly, else the dtype of the first parameter.  Never below
+    DEFAULT_DTYPE_BYTES: ComfyUI runs fp8 / int8 stored weights through a
+    fp16 / bf16 manual cast, so activations are at least that wide.
+    """
+    base = getattr(model, "model", None)
+    if base is None:
+        return None
+    dtype = getattr(base, "manual_cast_dtype", None)
+    if dtype is None:
+        try:
+            dtype = next(iter(base.parameters())).dtype
+        except Exception:
+            return None
+    size = getattr(dtype, "itemsize", None)
+    if not isinstance(size, int) or size <= 0:
+        return None
+    return max(DEFAULT_DTYPE_BYTES, size)
+
+
+# (id(model), width, height, dtype_bytes) → (model_ref, model_label, hidden_dim,
+# dim_detected, element_size, bytes_per_frame). model_ref guards against a
+# recycled id(); oldest entries are dropped past _FRAME_CACHE_SIZE.
+_FRAME_CACHE_SIZE = 32
+_frame_cache = {}
+
+
+def _none_ref():
+    return None
+
+
+def _frame_geometry(model, width, height, dtype_bytes=0):
+    """Return (model_label, hidden_dim, dim_detected, element_size, bytes_per_frame).
+
+    bytes_per_frame is per latent frame when the model's hidden_dim was
+    detected, per physical frame for the generic fallback.  dtype_bytes > 0
+    overrides the detected element size.  Memoized per
+    (model, width, height, dtype_bytes).
+    """
+    key = (id(model), width, height, dtype_bytes)
+    entry = _frame_cache.get(key)
+    if entry is not None and entry[0]() is model:
+        return entry[1:]
+
+    model_name, hidden_dim, _ = _get_model_info(model)
+    dim_detected = hidden_dim is not None
+    if not dim_detected:
+        hidden_dim = 1536
+        model_label = "generic"
+    else:
+        model_label = model_name or "connected"
+
+    element_size = dtype_bytes or _activation_bytes(model) or DEFAULT_DTYPE_BYTES
+
+    spatial_tokens = (width >> 3) * (height >> 3)  # ÷ 8 each way
+    bytes_per_frame = TENSOR_COPIES * spatial_tokens * hidden_dim * element_size
+    geometry = (model_label, hidden_dim, dim_detected, element_size, bytes_per_frame)
+
+    try:
+        model_ref = weakref.ref(model) if model is not None else _none_ref
+    except TypeError:  # not weak-referenceable: don't cache
+        return geometry
+    if len(_frame_cache) >= _FRAME_CACHE_SIZE:
+        del _frame_cache[next(iter(_frame_cache))]
+    _frame_cache[key] = (model_ref,) + geometry
+    return geometry
+
+
+_INPUT_TYPES = {
+    "required": {
+        "width": ("INT", {"default": 832, "min": 64, "max": 8192, "step": 8}),
+        "height": ("INT", {"default": 480, "min": 64, "max": 8192, "step": 8}),
+        "fps": (
+            "FLOAT",
+            {"default": 16.0, "min": 1.0, "max": 120.0, "step": 1.0},
+        ),
+        "duration": (
+            "FLOAT",
+            {"default": 10.0, "min": 0.1, "max": 3600.0, "step": 0.1},
+        ),
+        "safety_margin": (
+            "FLOAT",
+            {
+                "default": 0.95,
+                "min": 0.01,
+                # "max": 1.0,
+                "step": 0.05,
+                "tooltip": "Fraction of total VRAM to budget (0.95 = 5% headroom).",
+            },
+        ),
+    },
+    "optional": {
+        "model": ("MODEL",),
+        "dtype_bytes": (
+            "INT",
+            {
+                "default": 0,
+                "min": 0,
+                "max": 8,
+                "tooltip": (
+                    "Bytes per activation element. 0 = auto-detect from the model's "
+                    "compute dtype (2 for fp16/bf16, 4 for fp32; 2 without a model)."
                 ),
             },
-            "optional": {
-                "model": ("MODEL",),
+        ),
+        "bytes_per_pixel": (
+            "INT",
+            {
+                "default": 0,
+                "min": 0,
+                "max": 65536,
+                "tooltip": (
+                    "Manual calibration: peak VRAM bytes per output pixel per frame "
+                    "(≈256 for Wan 1.3B). 0 = derive from the model."
+                ),
             },
-        }
+        ),
+    },
+}
+
+
+class OliVideoFrameLimit:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return _INPUT_TYPES
 
     RETURN_TYPES = ("INT", "INT", "INT", "FLOAT", "FLOAT")
     RETURN_NAMES = ("width", "height", "frames", "fps", "duration")
@@ -132,74 +321,78 @@ class OliVideoFrameLimit:
     FUNCTION = "execute"
     CATEGORY = "Oli/utils"
 
-    def execute(self, width, height, duration, fps, safety_margin=0.95, model=None):
+    def execute(
+        self,
+        width,
+        height,
+        duration,
+        fps,
+        safety_margin=0.95,
+        model=None,
+        dtype_bytes=0,
+        bytes_per_pixel=0,
+    ):
 
         requested_frames = max(1, round(duration * fps) + 1)  # +1: reference frame
 
-        if not torch.cuda.is_available():
+        if not _cuda_available():
+            result = (width, height, requested_frames, float(fps), float(duration))
+            if not _UI_ENABLED:
+                return {"result": result}
             info = "CUDA not available — no frame limit applied."
-            return {
-                "ui": {"text": [info]},
-                "result": (
-                    width,
-                    height,
-                    requested_frames,
-                    float(fps),
-                    float(duration),
-                ),
-            }
-
-        total_vram = torch.cuda.get_device_properties(0).total_memory
-        vram_gb = total_vram / (1024**3)
-        vram_budget = total_vram * safety_margin
-
-        model_name, hidden_dim, debug_lines = _get_model_info(model)
-        dim_detected = hidden_dim is not None
-        if not dim_detected:
-            hidden_dim = 1536
-            model_label = "generic"
+            return {"ui": {"text": [info]}, "result": result}
+
+        import torch
+        device = torch.cuda.current_device()
+        total_vram = _total_vram(device)
+        foreign_vram = _foreign_vram(device)
+        vram_budget = int((total_vram - foreign_vram) * safety_margin)
+
+        if bytes_per_pixel:
+            # Manual calibration: empirical cost per output pixel per physical
+            # frame; no model introspection, no temporal compression assumed.
+            dim_detected = False
+            bytes_per_frame = width * height * bytes_per_pixel
         else:
-            model_label = model_name or "connected"
-
-        spatial_tokens = (width // 8) * (height // 8)
-
-        def snap(f):
-            n = (f - 1) // TEMPORAL_COMPRESSION
-            return max(1, n * TEMPORAL_COMPRESSION + 1)
+            (
+                model_label, hidden_dim, dim_detected, element_size, bytes_per_frame
+            ) = _frame_geometry(model, width, height, dtype_bytes)
 
         if dim_detected:
             # Known model: the 3D VAE compresses TEMPORAL_COMPRESSION physical frames
             # into one latent frame before attention, so budget is in latent-frame units.
-            bytes_per_latent_frame = TENSOR_COPIES * spatial_tokens * hidden_dim * 2
-            max_latent_frames = max(1, int(vram_budget / bytes_per_latent_frame))
+            max_latent_frames = max(1, vram_budget // bytes_per_frame)
             max_physical_frames = (max_latent_frames - 1) * TEMPORAL_COMPRESSION + 1
         else:
             # Generic fallback: no temporal compression assumed; calibrated at
             # ~256 bytes/pixel for hidden_dim=1536, matching empirical data.
-            bytes_per_frame = TENSOR_COPIES * spatial_tokens * hidden_dim * 2
-            max_physical_frames = max(1, int(vram_budget / bytes_per_frame))
+            max_physical_frames = max(1, vram_budget // bytes_per_frame)
 
-        actual_frames = snap(min(requested_frames, max_physical_frames))
+        actual_frames = _snap_frames(min(requested_frames, max_physical_frames))
         actual_duration = (actual_frames - 1) / fps  # -1: reference frame
 
-        info = (
-            f"CUDA VRAM: {vram_gb:.1f} GB\n"
-            f"model: {model_label}\n"
-            f"dim: {hidden_dim}\n"
-            f"requested: {requested_frames} frames\n"
-            f"capped: {actual_frames} frames ({actual_duration:.2f}s)"
-        )
-
-        return {
-            "ui": {"text": [info]},
-            "result": (
-                width,
-                height,
-                actual_frames,
-                float(fps),
-                float(actual_duration),
-            ),
-        }
+        result = (width, height, actual_frames, float(fps), float(actual_duration))
+        if not _UI_ENABLED:
+            return {"result": result}
+
+        lines = [f"CUDA VRAM: {_vram_gb_label(device)} GB"]
+        if foreign_vram:
+            lines.append(f"used by other processes: {foreign_vram / (1024**3):.1f} GB")
+        if bytes_per_pixel:
+            lines.append(f"manual: {bytes_per_pixel} bytes/pixel")
+        else:
+            lines += [
+                f"model: {model_label}",
+                f"dim: {hidden_dim}",
+                f"dtype: {element_size} bytes",
+            ]
+        lines += [
+            f"requested: {requested_frames} frames",
+            f"capped: {actual_frames} frames ({actual_duration:.2f}s)",
+        ]
+        info = "\n".join(lines)
+
+        return {"ui": {"text": [info]}, "result": result}
 
 
 NODE_CLASS_MAPPINGS = {